@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 
 from homeassistant.helpers import issue_registry
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED, EventEntityRegistryUpdatedData
 from homeassistant.helpers.area_registry import EVENT_AREA_REGISTRY_UPDATED, EventAreaRegistryUpdatedData
@@ -16,7 +17,13 @@ from .auto_area import (
     AutoArea,
 )
 
-from .const import DOMAIN, LOGGER, ISSUE_TYPE_YAML_DETECTED
+from .const import (
+    DOMAIN,
+    LOGGER,
+    ISSUE_TYPE_YAML_DETECTED,
+    REGISTRY_SETTLE_TIMEOUT,
+    REGISTRY_UPDATE_COOLDOWN,
+)
 
 PLATFORMS: list[Platform] = [Platform.SWITCH,
                              Platform.BINARY_SENSOR, Platform.SENSOR]
@@ -34,25 +41,59 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await async_init(hass, entry, auto_area)
     else:
         # Schedule initialization when HA is started and initialized
-        # https://developers.home-assistant.io/docs/asyncio_working_with_async/#calling-async-functions-from-threads
-
-        @callback
-        def init(hass: HomeAssistant, entry: ConfigEntry, auto_area: AutoArea):
-            asyncio.run_coroutine_threadsafe(
-                async_init(hass, entry, auto_area), hass.loop
-            ).result()
+        async def async_init_at_start(_event: Event) -> None:
+            await async_init(hass, entry, auto_area)
 
         hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_STARTED,
-            lambda params: init(hass, entry, auto_area)
+            async_init_at_start
         )
 
     return True
 
 
+async def async_wait_for_entity_registry(hass: HomeAssistant) -> None:
+    """Wait until the entity registry stops changing, or the settle timeout passes."""
+    ready = asyncio.Event()
+    quiet_timer = hass.loop.call_later(REGISTRY_UPDATE_COOLDOWN, ready.set)
+    fallback_timer = hass.loop.call_later(REGISTRY_SETTLE_TIMEOUT, ready.set)
+
+    @callback
+    def async_entity_registry_updated(_event: Event[EventEntityRegistryUpdatedData]) -> None:
+        """Restart the quiet period."""
+        nonlocal quiet_timer
+        quiet_timer.cancel()
+        quiet_timer = hass.loop.call_later(REGISTRY_UPDATE_COOLDOWN, ready.set)
+
+    unsubscribe = hass.bus.async_listen(
+        EVENT_ENTITY_REGISTRY_UPDATED, async_entity_registry_updated)
+    try:
+        await ready.wait()
+    finally:
+        unsubscribe()
+        quiet_timer.cancel()
+        fallback_timer.cancel()
+
+
 async def async_init(hass: HomeAssistant, entry: ConfigEntry, auto_area: AutoArea):
     """Initialize component."""
 
+    @callback
+    def async_rescan_entities() -> None:
+        """Rescan the registries and update the entities tracked by each auto entity."""
+        auto_area.invalidate_valid_entities()
+        for auto_entity in auto_area.auto_entities.values():
+            auto_entity.async_update_tracked_entity_ids()
+
+    # Registry updates tend to arrive in bursts, collapse them into a single rescan
+    rescan_debouncer = Debouncer(
+        hass,
+        LOGGER,
+        cooldown=REGISTRY_UPDATE_COOLDOWN,
+        immediate=False,
+        function=async_rescan_entities,
+    )
+
     @callback
     def async_entity_registry_updated(event: Event[EventEntityRegistryUpdatedData]) -> None:
         """Handle entity registry updated event."""
@@ -61,26 +102,14 @@ async def async_init(hass: HomeAssistant, entry: ConfigEntry, auto_area: AutoAre
                 # Event is update but no change in area, ignore event
                 return
         # Create and Remove events do not attach entity data so assume there's been a change
-        for auto_entity in auto_area.auto_entities.values():
-            current_ids = auto_entity.entity_ids
-            new_ids = auto_entity.get_sensor_entities()
-            if sorted(current_ids) == sorted(new_ids):
-                # No change in entity ids, check next auto entity
-                continue
-            auto_entity.async_update_tracked_entity_ids()
+        rescan_debouncer.async_schedule_call()
 
     @callback
     def async_area_registry_updated(event: Event[EventAreaRegistryUpdatedData]) -> None:
         """Handle area registry updated."""
         if event.data["area_id"] != auto_area.area_id:
             return
-        for auto_entity in auto_area.auto_entities.values():
-            current_ids = auto_entity.entity_ids
-            new_ids = auto_entity.get_sensor_entities()
-            if sorted(current_ids) == sorted(new_ids):
-                # No change in entity ids, check next auto entity
-                continue
-            auto_entity.async_update_tracked_entity_ids()
+        rescan_debouncer.async_schedule_call()
 
     @callback
     def async_device_registry_updated(event: Event[EventDeviceRegistryUpdatedData]) -> None:
@@ -88,23 +117,18 @@ async def async_init(hass: HomeAssistant, entry: ConfigEntry, auto_area: AutoAre
         if event.data["action"] == "update":
             if event.data["changes"].get("area_id", None) != auto_area.area_id:
                 return
-        for auto_entity in auto_area.auto_entities.values():
-            current_ids = auto_entity.entity_ids
-            new_ids = auto_entity.get_sensor_entities()
-            if sorted(current_ids) == sorted(new_ids):
-                # No change in entity ids, check next auto entity
-                continue
-            auto_entity.async_update_tracked_entity_ids()
+        rescan_debouncer.async_schedule_call()
 
-    await asyncio.sleep(5)  # wait for all area devices to be initialized
+    await async_wait_for_entity_registry(hass)  # wait for all area devices to be initialized
     await auto_area.async_initialize()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    hass.bus.async_listen(EVENT_ENTITY_REGISTRY_UPDATED,
-                          async_entity_registry_updated)
-    hass.bus.async_listen(EVENT_AREA_REGISTRY_UPDATED,
-                          async_area_registry_updated)
-    hass.bus.async_listen(EVENT_DEVICE_REGISTRY_UPDATED,
-                          async_device_registry_updated)
+    entry.async_on_unload(hass.bus.async_listen(EVENT_ENTITY_REGISTRY_UPDATED,
+                                                async_entity_registry_updated))
+    entry.async_on_unload(hass.bus.async_listen(EVENT_AREA_REGISTRY_UPDATED,
+                                                async_area_registry_updated))
+    entry.async_on_unload(hass.bus.async_listen(EVENT_DEVICE_REGISTRY_UPDATED,
+                                                async_device_registry_updated))
+    entry.async_on_unload(rescan_debouncer.async_shutdown)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
@@ -1,7 +1,8 @@
 """Core area functionality."""
 from __future__ import annotations
-from ast import TypeVar
-from typing import Any, Sequence, Union
+from functools import cached_property
+from itertools import chain
+from typing import TYPE_CHECKING
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.area_registry import async_get as async_get_area_registry
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
@@ -10,29 +11,30 @@ from homeassistant.helpers.issue_registry import async_create_issue, IssueSeveri
 from homeassistant.config_entries import ConfigEntry
 
 from homeassistant.helpers.area_registry import AreaEntry
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_registry import RegistryEntry
 
 from .auto_lights import AutoLights
-from .ha_helpers import get_all_entities, is_valid_entity
+from .ha_helpers import filter_valid_entities, get_all_entities
 from .const import (
     CONFIG_LIGHT_CONTROL,
     CONFIG_AREA,
     DOMAIN,
     ISSUE_TYPE_INVALID_AREA,
     LOGGER,
+    NAME,
     RELEVANT_DOMAINS,
+    VERSION,
 )
 
+if TYPE_CHECKING:
+    from .auto_entity import AutoEntity
+
 
 class AutoAreasError(Exception):
     """Exception to indicate a general API error."""
 
 
-def flatten_ids(entity_ids: Sequence[Union[str, list[str]]]) -> list[str]:
-    """Flatten a list of lists."""
-    return [item for sublist in entity_ids for item in (flatten_ids(sublist) if isinstance(sublist, list) else [sublist])]
-
-
 class AutoArea:
     """Class to manage fetching data from the API."""
 
@@ -52,7 +54,9 @@ class AutoArea:
         self.area: AreaEntry | None = self.area_registry.async_get_area(
             self.area_id or "")
         self.auto_lights = None
-        self.auto_entities: dict[str, Any] = {}
+        self.auto_entities: dict[str, AutoEntity] = {}
+        self._valid_entities_cache: list[RegistryEntry] | None = None
+        self._device_class_index: dict[str, list[str]] | None = None
         if self.area_id is None or self.area is None:
             async_create_issue(
                 hass,
@@ -83,7 +87,9 @@ class AutoArea:
     @property
     def tracked_entity_ids(self) -> list[str]:
         """Tracked entity ids."""
-        return flatten_ids([auto_entity.entity_ids for auto_entity in self.auto_entities.values()])
+        return list(chain.from_iterable(
+            auto_entity.entity_ids for auto_entity in self.auto_entities.values()
+        ))
 
     def cleanup(self):
         """Deinitialize this area."""
@@ -94,20 +100,54 @@ class AutoArea:
         if self.auto_lights:
             self.auto_lights.cleanup()
 
+    def invalidate_valid_entities(self) -> None:
+        """Drop the cached valid entities so the next lookup rescans the registries."""
+        self._valid_entities_cache = None
+        self._device_class_index = None
+
     def get_valid_entities(self) -> list[RegistryEntry]:
         """Return all valid and relevant entities for this area."""
-        entities = [
-            entity
-            for entity in get_all_entities(
+        if self._valid_entities_cache is not None:
+            return self._valid_entities_cache
+
+        self._valid_entities_cache = filter_valid_entities(
+            self.hass,
+            get_all_entities(
                 self.entity_registry,
                 self.device_registry,
                 self.area_id or "",
                 RELEVANT_DOMAINS,
                 exclude_auto_areas=True
             )
-            if is_valid_entity(self.hass, entity)
-        ]
-        return entities
+        )
+        return self._valid_entities_cache
+
+    def get_entity_ids_by_device_class(self, device_class: str) -> list[str]:
+        """Return valid entity ids whose (original) device class matches."""
+        if self._device_class_index is None:
+            index: dict[str, list[str]] = {}
+            for entity in self.get_valid_entities():
+                entity_id = entity.entity_id
+                entity_device_class = entity.device_class
+                original_device_class = entity.original_device_class
+                if entity_device_class is not None:
+                    index.setdefault(entity_device_class, []).append(entity_id)
+                if original_device_class is not None \
+                        and original_device_class != entity_device_class:
+                    index.setdefault(original_device_class, []).append(entity_id)
+            self._device_class_index = index
+        return self._device_class_index.get(device_class, [])
+
+    @cached_property
+    def device_info(self) -> DeviceInfo:
+        """Information about the device shared by all entities of this area."""
+        return {
+            "identifiers": {(DOMAIN, self.config_entry.entry_id)},
+            "name": NAME,
+            "model": VERSION,
+            "manufacturer": NAME,
+            "suggested_area": self.area_name,
+        }
 
     @property
     def area_name(self) -> str:
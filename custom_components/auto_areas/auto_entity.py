@@ -1,13 +1,15 @@
 """Base auto-entity class."""
 
+import asyncio
+from math import isfinite, nan
 from functools import cached_property
-from typing import Any, Collection, Generic, Mapping, TypeVar, cast
+from typing import Any, Generic, Mapping, TypeVar, cast
 
 from homeassistant.core import (
     Event, EventStateChangedData, State, HomeAssistant, CALLBACK_TYPE,
     callback
 )
-from homeassistant.const import STATE_UNKNOWN, STATE_UNAVAILABLE
+from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -15,16 +17,25 @@ from homeassistant.helpers import start
 from homeassistant.components.sensor.const import SensorDeviceClass
 from homeassistant.helpers.event import async_track_state_change_event
 
-from .calculations import get_calculation, get_calculation_key
+from .calculations import (CALCULATE_LAST, NUMERIC_CALCULATIONS, NumericAggregator,
+                           create_aggregator, get_calculation_key)
 from .auto_area import AutoArea
+from .ha_helpers import INVALID_STATES
 from .const import (CONFIG_EXCLUDED_HUMIDITY_ENTITIES, CONFIG_EXCLUDED_ILLUMINANCE_ENTITIES,
-                    CONFIG_EXCLUDED_TEMPERATURE_ENTITIES, DOMAIN, LOGGER, NAME, VERSION)
+                    CONFIG_EXCLUDED_TEMPERATURE_ENTITIES, LOGGER)
 
 _TDeviceClass = TypeVar(
     "_TDeviceClass", BinarySensorDeviceClass, SensorDeviceClass)
 _TEntity = TypeVar("_TEntity", bound=Entity)
 _TState = TypeVar("_TState")
 
+# Option holding the excluded entities for each device class
+_EXCLUDED_ENTITIES_OPTION: dict[str, str] = {
+    SensorDeviceClass.TEMPERATURE: CONFIG_EXCLUDED_TEMPERATURE_ENTITIES,
+    SensorDeviceClass.HUMIDITY: CONFIG_EXCLUDED_HUMIDITY_ENTITIES,
+    SensorDeviceClass.ILLUMINANCE: CONFIG_EXCLUDED_ILLUMINANCE_ENTITIES,
+}
+
 
 class AutoEntity(Entity, Generic[_TEntity, _TDeviceClass, _TState]):
     """Set up an aggregated entity."""
@@ -41,42 +52,51 @@ class AutoEntity(Entity, Generic[_TEntity, _TDeviceClass, _TState]):
         super().__init__()
         self.hass = hass
         self.auto_area = auto_area
-        auto_area.auto_entities[device_class] = self
+        auto_area.auto_entities[device_class.value] = self
         self.entity_states: dict[str, State] = {}
+        self._entities_attr_cache: dict[str, str] | None = None
         self._extra_attributes: dict[str, Any] = {}
+        self._state_attributes_cache: dict[str, Any] | None = None
         self._device_class = device_class
+        self._calculation_key = get_calculation_key(
+            auto_area.config_entry.options, device_class)
+        # Options changes reload the config entry, so these are resolved once
+        self._aggregator = create_aggregator(self._calculation_key)
+        self._aggregate_numeric = self._calculation_key in NUMERIC_CALCULATIONS
+        # Numeric calculations read from the same values as the platform statistics
+        self._numeric_values = cast(NumericAggregator, self._aggregator) \
+            if self._aggregate_numeric else NumericAggregator()
+        self._aggregate_last = self._calculation_key == CALCULATE_LAST
+        excluded_option = _EXCLUDED_ENTITIES_OPTION.get(device_class)
+        self._excluded_entities: frozenset[str] = frozenset(
+            auto_area.config_entry.options.get(excluded_option, [])
+            if excluded_option is not None else []
+        )
         self._name_prefix = name_prefix
         self._prefix = prefix
-        self._check_entities: bool = False
 
         self.entity_ids: list[str] = []
+        self._entity_ids_set: frozenset[str] = frozenset()
 
         self._aggregated_state: _TState | str | None = None
         self._async_unsub_state_changed: CALLBACK_TYPE | None = None
+        self._update_handle: asyncio.Handle | None = None
         LOGGER.info(
             "%s: Initialized %s sensor",
             self.auto_area.area_name,
             self.device_class
         )
 
-    @property
-    def _excluded_entities(self) -> list[str]:
-        """Retrieve excluded entities."""
-        if self._device_class == SensorDeviceClass.TEMPERATURE:
-            return self.auto_area.config_entry.options.get(CONFIG_EXCLUDED_TEMPERATURE_ENTITIES, [])
-        if self._device_class == SensorDeviceClass.HUMIDITY:
-            return self.auto_area.config_entry.options.get(CONFIG_EXCLUDED_HUMIDITY_ENTITIES, [])
-        if self._device_class == SensorDeviceClass.ILLUMINANCE:
-            return self.auto_area.config_entry.options.get(CONFIG_EXCLUDED_ILLUMINANCE_ENTITIES, [])
-        return []
-
     def get_sensor_entities(self) -> list[str]:
         """Retrieve all relevant entity ids for this sensor."""
+        entity_ids = self.auto_area.get_entity_ids_by_device_class(self._device_class)
+        excluded = self._excluded_entities
+        if not excluded:
+            return list(entity_ids)
         return [
-            entity.entity_id
-            for entity in self.auto_area.get_valid_entities()
-            if (entity.device_class == self.device_class
-                or entity.original_device_class == self.device_class) and entity.entity_id not in self._excluded_entities
+            entity_id
+            for entity_id in entity_ids
+            if entity_id not in excluded
         ]
 
     @cached_property
@@ -97,51 +117,41 @@ class AutoEntity(Entity, Generic[_TEntity, _TDeviceClass, _TState]):
     @cached_property
     def device_info(self) -> DeviceInfo:
         """Information about this device."""
-        return {
-            "identifiers": {(DOMAIN, self.auto_area.config_entry.entry_id)},
-            "name": NAME,
-            "model": VERSION,
-            "manufacturer": NAME,
-            "suggested_area": self.auto_area.area_name,
-        }
+        return self.auto_area.device_info
 
-    @cached_property
+    @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return entity specific state attributes.
 
         Implemented by platform classes. Convention for attribute names
         is lowercase snake_case.
         """
-        return {
-            "calculation": get_calculation_key(
-                self.auto_area.config_entry.options,
-                self.device_class
-            ),
-            "entities": {state.entity_id: state.state for state in self.entity_states.values()},
-            **self._extra_attributes
-        }
+        entities = self._entities_attr
+        attributes = self._state_attributes_cache
+        if attributes is None or attributes["entities"] is not entities:
+            attributes = self._state_attributes_cache = {
+                "calculation": self._calculation_key,
+                "entities": entities,
+                **self._extra_attributes
+            }
+        return attributes
+
+    def _set_extra_attributes(self, extra_attributes: dict[str, Any]) -> None:
+        """Set the platform specific state attributes."""
+        if extra_attributes != self._extra_attributes:
+            self._extra_attributes = extra_attributes
+            self._state_attributes_cache = None
 
     async def async_added_to_hass(self):
         """Start tracking sensors."""
-        @callback
-        def async_state_changed_listener(
-            event: Event[EventStateChangedData],
-        ) -> None:
-            """Handle child updates."""
-            self.async_set_context(event.context)
-            self.async_defer_or_update_ha_state()
-
-        self.entity_ids = self.get_sensor_entities()
-
-        self.async_on_remove(
-            async_track_state_change_event(
-                self.hass, self.entity_ids, async_state_changed_listener
-            )
-        )
+        self._async_set_entity_ids(self.get_sensor_entities())
+        self.async_on_remove(self._async_stop)
         self.async_on_remove(start.async_at_start(
             self.hass, self._update_at_start))
+        self.async_on_remove(self._async_cancel_update)
 
-    async def _async_state_changed_listener(
+    @callback
+    def _async_state_changed_listener(
         self, event: Event[EventStateChangedData]
     ) -> None:
         """Respond to a member state changing.
@@ -156,26 +166,31 @@ class AutoEntity(Entity, Generic[_TEntity, _TDeviceClass, _TState]):
 
         if (new_state := event.data["new_state"]) is None:
             # The state was removed from the state machine
-            self._reset_tracked_state()
+            changed = self._forget_state(event.data["entity_id"])
+        else:
+            changed = self._see_state(new_state)
+        if not changed:
+            return
 
-        self._async_update_group_state(new_state)
-        self.async_write_ha_state()
+        self.async_defer_or_update_ha_state()
 
     def _reset_tracked_state(self) -> None:
         """Reset tracked state."""
-        self.entity_ids = self.get_sensor_entities()
         self.entity_states = {}
+        self._entities_attr_cache = None
+        self._numeric_values.clear()
+        if self._aggregator is not None and not self._aggregate_numeric:
+            self._aggregator.clear()
 
+        states_get = self.hass.states.get
+        see_state = self._see_state
         for entity_id in self.entity_ids:
-            if (state := self.hass.states.get(entity_id)) is not None:
-                self._see_state(state)
+            if (state := states_get(entity_id)) is not None:
+                see_state(state)
 
     @callback
-    def _async_update_group_state(self, new_state: State | None = None) -> None:
+    def _async_update_group_state(self) -> None:
         """Update group state."""
-        if new_state:
-            self._see_state(new_state)
-
         self._aggregated_state = self._get_state()
 
     @callback
@@ -189,16 +204,12 @@ class AutoEntity(Entity, Generic[_TEntity, _TDeviceClass, _TState]):
             self._async_unsub_state_changed = None
 
     @callback
-    def _async_start_tracking(self) -> None:
-        """Start tracking members.
-
-        This method must be run in the event loop.
-        """
+    def _async_subscribe(self) -> None:
+        """Subscribe to state changes of the members."""
         if self.entity_ids and self._async_unsub_state_changed is None:
             self._async_unsub_state_changed = async_track_state_change_event(
                 self.hass, self.entity_ids, self._async_state_changed_listener
             )
-        self._async_update_group_state()
 
     @callback
     def async_update_tracked_entity_ids(
@@ -208,24 +219,34 @@ class AutoEntity(Entity, Generic[_TEntity, _TDeviceClass, _TState]):
 
         This method must be run in the event loop.
         """
-        if sorted(self.entity_ids) == sorted(self.get_sensor_entities()):
+        previous_ids = self._entity_ids_set
+        if not self._async_set_entity_ids(self.get_sensor_entities()):
             return
 
-        self._async_stop()
-        self._reset_tracked_state()
-        self._async_start_tracking()
+        # Only members that left or joined need to be forgotten or read
+        for entity_id in previous_ids - self._entity_ids_set:
+            self._forget_state(entity_id)
+        states_get = self.hass.states.get
+        for entity_id in self._entity_ids_set - previous_ids:
+            self._see_state(states_get(entity_id))
+        self.async_update_group_state()
         self.async_write_ha_state()
 
-    def _set_tracked(self, entity_ids: Collection[str] | None) -> None:
-        """Tuple of entities to be tracked."""
-        # tracking are the entities we want to track
-        # trackable are the entities we actually watch
+    @callback
+    def _async_set_entity_ids(self, entity_ids: list[str]) -> bool:
+        """Track the given entity ids, resubscribing only when they changed.
+
+        This method must be run in the event loop.
+        """
+        entity_ids_set = frozenset(entity_ids)
+        if entity_ids_set == self._entity_ids_set:
+            return False
 
-        if not entity_ids:
-            self.tracking = ()
-            self.trackable = ()
-            self.single_state_type_key = None
-            return
+        self._async_stop()
+        self.entity_ids = entity_ids
+        self._entity_ids_set = entity_ids_set
+        self._async_subscribe()
+        return True
 
     @callback
     def async_update_group_state(self) -> None:
@@ -235,44 +256,94 @@ class AutoEntity(Entity, Generic[_TEntity, _TDeviceClass, _TState]):
     @callback
     def _update_at_start(self, _: HomeAssistant) -> None:
         """Update the group state at start."""
+        self._async_set_entity_ids(self.get_sensor_entities())
         self._reset_tracked_state()
         self.async_update_group_state()
         self.async_write_ha_state()
 
     @callback
     def async_defer_or_update_ha_state(self) -> None:
-        """Only update once at start."""
-        if not self.hass.is_running:
+        """Only update once at start.
+
+        Updates arriving in the same event loop iteration are coalesced
+        into a single recalculation and state write.
+        """
+        if not self.hass.is_running or self._update_handle is not None:
             return
+        self._update_handle = self.hass.loop.call_soon(self._async_flush_update)
+
+    @callback
+    def _async_flush_update(self) -> None:
+        """Recalculate and write the state for all pending updates."""
+        self._update_handle = None
         self.async_update_group_state()
         self.async_write_ha_state()
 
-    def _see_state(self, state: State | None) -> None:
-        """Keep track of the state."""
+    @callback
+    def _async_cancel_update(self) -> None:
+        """Cancel a pending state update."""
+        if self._update_handle is not None:
+            self._update_handle.cancel()
+            self._update_handle = None
+
+    def _see_state(self, state: State | None) -> bool:
+        """Keep track of the state.
+
+        Returns whether the calculated state may have changed.
+        """
         if state is None:
-            return
-        if state.state is not None and state.state in [
-            STATE_UNKNOWN,
-            STATE_UNAVAILABLE,
-        ]:
-            self.entity_states.pop(state.entity_id, None)
+            return False
+        if state.state in INVALID_STATES:
+            return self._forget_state(state.entity_id)
+
+        entity_id = state.entity_id
+        previous_state = self.entity_states.get(entity_id)
+        self.entity_states[entity_id] = state
+        if self._aggregator is not None and not self._aggregate_numeric:
+            self._aggregator.update(entity_id, state)
+        if previous_state is not None and previous_state.state == state.state:
+            # Same value as before, only the last calculation also depends on when
+            return self._aggregate_last
+        self._entities_attr_cache = None
+        try:
+            value = float(state.state)
+        except ValueError:
+            value = nan
+        if not isfinite(value):
+            self._numeric_values.remove(entity_id)
         else:
-            try:
-                self.entity_states[state.entity_id] = state
-            except ValueError:
-                self.entity_states.pop(state.entity_id, None)
+            self._numeric_values.update(entity_id, value)
+        return True
+
+    def _forget_state(self, entity_id: str) -> bool:
+        """Stop keeping track of the state.
+
+        Returns whether the state was tracked.
+        """
+        if self.entity_states.pop(entity_id, None) is None:
+            return False
+        self._entities_attr_cache = None
+        self._numeric_values.remove(entity_id)
+        if self._aggregator is not None and not self._aggregate_numeric:
+            self._aggregator.remove(entity_id)
+        return True
+
+    @property
+    def _entities_attr(self) -> dict[str, str]:
+        """Values of the tracked states, rebuilt only after one of them changed."""
+        if self._entities_attr_cache is None:
+            self._entities_attr_cache = {
+                entity_id: state.state for entity_id, state in self.entity_states.items()
+            }
+        return self._entities_attr_cache
 
     def _get_state(self) -> _TState | str | None:
         """Get the state of the sensor."""
-        if len(self.entity_states.values()) == 0:
+        if not self.entity_states:
             self._attr_available = False
             return STATE_UNAVAILABLE
 
-        calculate_state = get_calculation(
-            self.auto_area.config_entry.options,
-            self.device_class
-        )
-        if calculate_state is None:
+        if self._aggregator is None:
             return None
 
-        return cast(_TState | str | None, calculate_state(list(self.entity_states.values())))
+        return cast(_TState | str | None, self._aggregator.value)
@@ -1,7 +1,7 @@
 """Auto lights."""
 from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
 from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.core import Event, EventStateChangedData
+from homeassistant.core import Event, EventStateChangedData, callback
 from homeassistant.const import (
     STATE_ON,
     SERVICE_TURN_ON,
@@ -258,7 +258,8 @@ class AutoLights:
                 )
                 self.lights_turned_on = True
 
-    async def handle_illuminance_change(self, _event: Event[EventStateChangedData]):
+    @callback
+    def handle_illuminance_change(self, _event: Event[EventStateChangedData]) -> None:
         """Handle changes in illuminance."""
 
         # Check for presence
@@ -286,10 +287,12 @@ class AutoLights:
             self.auto_area.area.name,
             self.light_entity_ids,
         )
-        await self.hass.services.async_call(
-            LIGHT_DOMAIN,
-            SERVICE_TURN_ON,
-            {ATTR_ENTITY_ID: self.light_entity_ids},
+        self.hass.async_create_task(
+            self.hass.services.async_call(
+                LIGHT_DOMAIN,
+                SERVICE_TURN_ON,
+                {ATTR_ENTITY_ID: self.light_entity_ids},
+            )
         )
 
     def is_below_illuminance_threshold(self) -> bool:
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from functools import cached_property
 from typing import Literal, override
 from homeassistant.core import Event, EventStateChangedData
 from homeassistant.const import STATE_ON, STATE_OFF
@@ -16,7 +15,7 @@ from homeassistant.helpers.event import async_track_state_change_event
 from .ha_helpers import all_states_are_off
 from .auto_entity import AutoEntity
 from .auto_area import AutoArea
-from .calculations import bool_states
+from .calculations import BooleanAggregator, count_bool_states
 from .const import (
     DOMAIN,
     LOGGER,
@@ -50,7 +49,7 @@ class PresenceBinarySensor(
         )
         LOGGER.debug("Presence entities %s", self.entity_ids)
 
-    @cached_property
+    @property
     def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
         if not isinstance(self._aggregated_state, bool):
@@ -58,7 +57,7 @@ class PresenceBinarySensor(
 
         return self._aggregated_state
 
-    @cached_property
+    @property
     def state(self) -> Literal["on", "off"] | None:  # type: ignore
         """Return the state of the binary sensor."""
         if (is_on := self.is_on) is None:
@@ -68,19 +67,22 @@ class PresenceBinarySensor(
     @override
     def get_sensor_entities(self) -> list[str]:
         """Retrieve all relevant presence entities."""
-        return [
-            entity.entity_id
-            for entity in self.auto_area.get_valid_entities()
-            if entity.device_class in PRESENCE_BINARY_SENSOR_DEVICE_CLASSES
-            or entity.original_device_class in PRESENCE_BINARY_SENSOR_DEVICE_CLASSES
-        ]
+        return list(dict.fromkeys(
+            entity_id
+            for device_class in PRESENCE_BINARY_SENSOR_DEVICE_CLASSES
+            for entity_id in self.auto_area.get_entity_ids_by_device_class(device_class)
+        ))
 
     @override
     def _get_state(self) -> bool | str | None:
         self._attr_native_value = super()._get_state()
-        bools = bool_states(list(self.entity_states.values()))
-        self._extra_attributes = {
-            "num_false": len([b for b in bools if not b]),
-            "num_true": len([b for b in bools if b])
-        }
+        if isinstance(self._aggregator, BooleanAggregator):
+            num_true = self._aggregator.num_true
+            num_false = self._aggregator.num_false
+        else:
+            num_true, num_false = count_bool_states(self.entity_states.values())
+        self._set_extra_attributes({
+            "num_false": num_false,
+            "num_true": num_true
+        })
         return self._attr_native_value
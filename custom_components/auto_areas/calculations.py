@@ -1,14 +1,17 @@
 """Perform calculations based on entity states."""
 from __future__ import annotations
-from statistics import mean, median
-from collections.abc import Callable
+from math import fsum
+from functools import partial
+from operator import attrgetter
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable
 from typing import Any
 from collections.abc import Mapping
 from homeassistant.core import State
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.components.sensor.const import SensorDeviceClass
 from homeassistant.helpers.typing import StateType
-from homeassistant.const import STATE_UNKNOWN, STATE_UNAVAILABLE
+from homeassistant.const import STATE_UNKNOWN
 
 from .const import (
     CONFIG_HUMIDITY_CALCULATION,
@@ -16,6 +19,7 @@ from .const import (
     CONFIG_PRESENCE_CALCULATION,
     CONFIG_TEMPERATURE_CALCULATION
 )
+from .ha_helpers import INVALID_STATES
 
 CALCULATE_MAX = "max"
 CALCULATE_MIN = "min"
@@ -26,116 +30,276 @@ CALCULATE_ALL = "all"
 CALCULATE_ONE = "one"
 CALCULATE_NONE = "none"
 
-
-def is_float(state: State) -> bool:
-    """Check if state is a float."""
-    try:
-        return float(state.state) is not None
-    except Exception:
-        return False
+_last_updated = attrgetter("last_updated")
+_TRUE_TOKENS = frozenset({"on", "yes", "true", "1", True, 1})
+_BOOL_TOKENS = _TRUE_TOKENS | frozenset({"off", "no", "false", "0", False, 0})
 
 
 def is_bool(state: State) -> bool:
     """Check if state is a boolean."""
-    try:
-        return isinstance(state.state, bool) or state.state in [
-            "on", "off", "yes", "no", "true", "false", "1", "0", True, False, 1, 0]
-    except Exception:
-        return False
+    return state.state in _BOOL_TOKENS
 
 
 def as_bool(state: State) -> bool:
     """Convert state to a boolean."""
-    if isinstance(state.state, bool):
-        return bool(state.state)
-    return state.state in [
-        "on", "yes", "true", "1", True, 1]
-
-
-def float_states(states: list[State]) -> list[float]:
-    """Filter and retrieve floats from list of states."""
-    return [float(s.state) for s in states if is_float(s)]
-
-
-def bool_states(states: list[State]) -> list[bool]:
-    """Filter and retrieve bools from list of states."""
-    return [as_bool(s) for s in states if is_bool(s)]
-
-
-def calculate_max(states: list[State]) -> StateType:
-    """Calculate the maximum of the list of values."""
-    calc_values = float_states(states)
-    if len(calc_values) == 0:
-        return STATE_UNKNOWN
-    return max(calc_values)
-
-
-def calculate_min(states: list[State]) -> StateType:
-    """Calculate the min of the list of values."""
-    calc_values = float_states(states)
-    if len(calc_values) == 0:
-        return STATE_UNKNOWN
-    return min(calc_values)
+    return state.state in _TRUE_TOKENS
 
 
-def calculate_mean(states: list[State]) -> StateType:
-    """Calculate the mean of the list of values."""
-    calc_values = float_states(states)
-    if len(calc_values) == 0:
-        return STATE_UNKNOWN
-    return mean(calc_values)
+def _median_of_sorted(values: list[float]) -> float:
+    middle = len(values) // 2
+    if len(values) % 2 == 1:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
 
 
-def calculate_median(states: list[State]) -> StateType:
-    """Calculate the median of the list of values."""
-    calc_values = float_states(states)
-    if len(calc_values) == 0:
-        return STATE_UNKNOWN
-    return median(calc_values)
+def count_bool_states(states: Iterable[State]) -> tuple[int, int]:
+    """Count the true and false states in a single pass."""
+    num_true = 0
+    num_false = 0
+    for state in states:
+        value = state.state
+        if value in _TRUE_TOKENS:
+            num_true += 1
+        elif value in _BOOL_TOKENS:
+            num_false += 1
+    return num_true, num_false
 
 
-def calculate_all(states: list[State]) -> StateType:
-    """Calculate whether all of the list of values are true."""
-    calc_values = bool_states(states)
-    if len(calc_values) == 0:
-        return STATE_UNKNOWN
-    return len([v for v in calc_values if not v]) == 0
+def _all_true(num_true: int, num_false: int) -> bool:
+    return num_false == 0
 
 
-def calculate_one(states: list[State]) -> StateType:
-    """Calculate whether one of the list of values is true."""
-    calc_values = bool_states(states)
-    if len(calc_values) == 0:
-        return STATE_UNKNOWN
-    return len([v for v in calc_values if v]) > 0
+def _one_true(num_true: int, num_false: int) -> bool:
+    return num_true > 0
 
 
-def calculate_none(states: list[State]) -> StateType:
-    """Calculate whether none of the list of values is true."""
-    calc_values = bool_states(states)
-    if len(calc_values) == 0:
-        return STATE_UNKNOWN
-    return len([v for v in calc_values if v]) == 0
+def _none_true(num_true: int, num_false: int) -> bool:
+    return num_true == 0
 
 
-def calculate_last(states: list[State]) -> StateType:
-    """Calculate the last update of the list of values."""
-    calc_values = [s for s in states if s.state is not None and s.state not in [
-        STATE_UNKNOWN, STATE_UNAVAILABLE]]
-    if len(calc_values) == 0:
-        return STATE_UNKNOWN
-    return sorted(calc_values, key=lambda v: v.last_updated, reverse=True)[0].state
+# Calculations operating on the numeric values of the states
+NUMERIC_CALCULATIONS: dict[str, Callable[[NumericAggregator], StateType]] = {
+    CALCULATE_MAX: attrgetter("maximum"),
+    CALCULATE_MEAN: attrgetter("mean"),
+    CALCULATE_MIN: attrgetter("minimum"),
+    CALCULATE_MEDIAN: attrgetter("median"),
+}
 
 
-CALCULATE = {
-    CALCULATE_MAX: calculate_max,
-    CALCULATE_MEAN: calculate_mean,
-    CALCULATE_MIN: calculate_min,
-    CALCULATE_MEDIAN: calculate_median,
-    CALCULATE_ALL: calculate_all,
-    CALCULATE_ONE: calculate_one,
-    CALCULATE_NONE: calculate_none,
-    CALCULATE_LAST: calculate_last,
+class Aggregator:
+    """Keep the result of a calculation up to date while its values change.
+
+    Values are the numeric state values for NUMERIC_CALCULATIONS and the
+    states themselves otherwise. Subclasses calculate the value, marking it
+    dirty when it needs to be recalculated before it is read.
+    """
+
+    def __init__(self) -> None:
+        """Initialize aggregator."""
+        self._values: dict[str, Any] = {}
+        self._result: StateType = STATE_UNKNOWN
+        self._dirty = False
+
+    def update(self, entity_id: str, value: Any) -> None:
+        """Set the value of an entity."""
+        self._values[entity_id] = value
+        self._dirty = True
+
+    def remove(self, entity_id: str) -> None:
+        """Remove the value of an entity."""
+        if entity_id in self._values:
+            del self._values[entity_id]
+            self._dirty = True
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._values.clear()
+        self._result = STATE_UNKNOWN
+        self._dirty = False
+
+    def __len__(self) -> int:
+        """Return the number of values."""
+        return len(self._values)
+
+    @property
+    def value(self) -> StateType:
+        """Return the calculated value."""
+        raise NotImplementedError
+
+
+class NumericAggregator(Aggregator):
+    """Keep the numeric values sorted to read the statistics over them.
+
+    The minimum, maximum and median are read from the sorted values, the
+    mean is calculated precisely with fsum, only after a value changed.
+    """
+
+    def __init__(
+        self,
+        calculate: Callable[[NumericAggregator], StateType] | None = None
+    ) -> None:
+        """Initialize aggregator, without a calculation the value is unknown."""
+        super().__init__()
+        self._calculate = calculate
+        self._sorted: list[float] = []
+
+    def _discard(self, value: float) -> None:
+        del self._sorted[bisect_left(self._sorted, value)]
+
+    def update(self, entity_id: str, value: float) -> None:
+        """Set the value of an entity."""
+        if (previous := self._values.get(entity_id)) is not None:
+            self._discard(previous)
+        super().update(entity_id, value)
+        insort(self._sorted, value)
+
+    def remove(self, entity_id: str) -> None:
+        """Remove the value of an entity."""
+        if (previous := self._values.get(entity_id)) is not None:
+            self._discard(previous)
+        super().remove(entity_id)
+
+    def clear(self) -> None:
+        """Remove all values."""
+        super().clear()
+        self._sorted.clear()
+
+    @property
+    def minimum(self) -> StateType:
+        """Return the minimum value."""
+        if len(self._sorted) == 0:
+            return STATE_UNKNOWN
+        return self._sorted[0]
+
+    @property
+    def maximum(self) -> StateType:
+        """Return the maximum value."""
+        if len(self._sorted) == 0:
+            return STATE_UNKNOWN
+        return self._sorted[-1]
+
+    @property
+    def mean(self) -> StateType:
+        """Return the mean of the values."""
+        if len(self._sorted) == 0:
+            return STATE_UNKNOWN
+        if self._dirty:
+            self._result = fsum(self._sorted) / len(self._sorted)
+            self._dirty = False
+        return self._result
+
+    @property
+    def median(self) -> StateType:
+        """Return the median of the values."""
+        if len(self._sorted) == 0:
+            return STATE_UNKNOWN
+        return _median_of_sorted(self._sorted)
+
+    @property
+    def value(self) -> StateType:
+        """Return the calculated value."""
+        if self._calculate is None:
+            return STATE_UNKNOWN
+        return self._calculate(self)
+
+
+class BooleanAggregator(Aggregator):
+    """Count the true and false states."""
+
+    def __init__(self, decide: Callable[[int, int], bool]) -> None:
+        """Initialize aggregator."""
+        super().__init__()
+        self._decide = decide
+        self.num_true = 0
+        self.num_false = 0
+
+    def _count(self, value: bool | None, delta: int) -> None:
+        if value is None:
+            return
+        if value:
+            self.num_true += delta
+        else:
+            self.num_false += delta
+
+    def update(self, entity_id: str, value: State) -> None:
+        """Set the value of an entity."""
+        self._count(self._values.get(entity_id), -1)
+        self._values[entity_id] = as_bool(value) if is_bool(value) else None
+        self._count(self._values[entity_id], 1)
+
+    def remove(self, entity_id: str) -> None:
+        """Remove the value of an entity."""
+        self._count(self._values.pop(entity_id, None), -1)
+
+    def clear(self) -> None:
+        """Remove all values."""
+        super().clear()
+        self.num_true = 0
+        self.num_false = 0
+
+    @property
+    def value(self) -> StateType:
+        """Return the calculated value."""
+        if self.num_true + self.num_false == 0:
+            return STATE_UNKNOWN
+        return self._decide(self.num_true, self.num_false)
+
+
+class LastAggregator(Aggregator):
+    """Keep track of the most recently updated state."""
+
+    def __init__(self) -> None:
+        """Initialize aggregator."""
+        super().__init__()
+        self._last: State | None = None
+
+    def update(self, entity_id: str, value: State) -> None:
+        """Set the value of an entity."""
+        previous = self._values.get(entity_id)
+        self._values[entity_id] = value
+        if self._dirty:
+            return
+        if previous is not None and previous is self._last \
+                and value.last_updated < previous.last_updated:
+            self._dirty = True
+        elif self._last is None or value.last_updated >= self._last.last_updated:
+            self._last = value
+
+    def remove(self, entity_id: str) -> None:
+        """Remove the value of an entity."""
+        if (previous := self._values.pop(entity_id, None)) is not None \
+                and previous is self._last:
+            self._dirty = True
+
+    def clear(self) -> None:
+        """Remove all values."""
+        super().clear()
+        self._last = None
+
+    @property
+    def value(self) -> StateType:
+        """Return the calculated value."""
+        if self._dirty:
+            self._last = max(
+                self._values.values(),
+                key=_last_updated,
+                default=None
+            )
+            self._dirty = False
+        if self._last is None or self._last.state in INVALID_STATES:
+            return STATE_UNKNOWN
+        return self._last.state
+
+
+AGGREGATORS: dict[str, Callable[[], Aggregator]] = {
+    **{
+        key: partial(NumericAggregator, calculate)
+        for key, calculate in NUMERIC_CALCULATIONS.items()
+    },
+    CALCULATE_ALL: lambda: BooleanAggregator(_all_true),
+    CALCULATE_ONE: lambda: BooleanAggregator(_one_true),
+    CALCULATE_NONE: lambda: BooleanAggregator(_none_true),
+    CALCULATE_LAST: LastAggregator,
 }
 
 # Default calculation methods
@@ -144,40 +308,36 @@ DEFAULT_CALCULATION_TEMPERATURE = CALCULATE_MEAN
 DEFAULT_CALCULATION_HUMIDITY = CALCULATE_MAX
 DEFAULT_CALCULATION_PRESENCE = CALCULATE_ALL
 
+# Option and default holding the calculation for each device class
+_CALCULATION_OPTION: dict[str, tuple[str, str]] = {
+    SensorDeviceClass.ILLUMINANCE: (
+        CONFIG_ILLUMINANCE_CALCULATION, DEFAULT_CALCULATION_ILLUMINANCE),
+    SensorDeviceClass.TEMPERATURE: (
+        CONFIG_TEMPERATURE_CALCULATION, DEFAULT_CALCULATION_TEMPERATURE),
+    SensorDeviceClass.HUMIDITY: (
+        CONFIG_HUMIDITY_CALCULATION, DEFAULT_CALCULATION_HUMIDITY),
+    BinarySensorDeviceClass.MOTION: (
+        CONFIG_PRESENCE_CALCULATION, DEFAULT_CALCULATION_PRESENCE),
+    BinarySensorDeviceClass.PRESENCE: (
+        CONFIG_PRESENCE_CALCULATION, DEFAULT_CALCULATION_PRESENCE),
+    BinarySensorDeviceClass.OCCUPANCY: (
+        CONFIG_PRESENCE_CALCULATION, DEFAULT_CALCULATION_PRESENCE),
+}
+
 
 def get_calculation_key(
     config_options: Mapping[str, Any],
     sensor_type: SensorDeviceClass | BinarySensorDeviceClass
 ) -> str | None:
     """Get the configured calculation key for the sensor provided."""
-    if sensor_type == SensorDeviceClass.ILLUMINANCE:
-        return config_options.get(
-            CONFIG_ILLUMINANCE_CALCULATION,
-            DEFAULT_CALCULATION_ILLUMINANCE)
-
-    if sensor_type == SensorDeviceClass.TEMPERATURE:
-        return config_options.get(
-            CONFIG_TEMPERATURE_CALCULATION,
-            DEFAULT_CALCULATION_TEMPERATURE)
-
-    if sensor_type == SensorDeviceClass.HUMIDITY:
-        return config_options.get(
-            CONFIG_HUMIDITY_CALCULATION,
-            DEFAULT_CALCULATION_HUMIDITY)
-    if sensor_type in [BinarySensorDeviceClass.MOTION, BinarySensorDeviceClass.PRESENCE, BinarySensorDeviceClass.OCCUPANCY]:
-        return config_options.get(
-            CONFIG_PRESENCE_CALCULATION,
-            DEFAULT_CALCULATION_PRESENCE
-        )
-    return None
-
-
-def get_calculation(
-    config_options: Mapping[str, Any],
-    sensor_type: SensorDeviceClass | BinarySensorDeviceClass
-) -> Callable[[list[State]], StateType] | None:
-    """Get the configured calculation for the sensor provided."""
-    key = get_calculation_key(config_options, sensor_type)
-    if key is None:
+    option = _CALCULATION_OPTION.get(sensor_type)
+    if option is None:
+        return None
+    return config_options.get(*option)
+
+
+def create_aggregator(key: str | None) -> Aggregator | None:
+    """Create an aggregator for the calculation key provided."""
+    if key is None or key not in AGGREGATORS:
         return None
-    return CALCULATE.get(key, None)
+    return AGGREGATORS[key]()
@@ -62,14 +62,19 @@ CONFIG_EXCLUDED_TEMPERATURE_ENTITIES = "excluded_temperature_entities"
 
 #
 
+# Seconds to wait for a burst of registry updates to settle before rescanning
+REGISTRY_UPDATE_COOLDOWN = 0.5
+# Maximum number of seconds to wait for the registry to settle during setup
+REGISTRY_SETTLE_TIMEOUT = 5
+
 
 # Fetch entities from these domains
-RELEVANT_DOMAINS = [
+RELEVANT_DOMAINS = frozenset({
     BINARY_SENSOR_DOMAIN,
     SENSOR_DOMAIN,
     SWITCH_DOMAIN,
     LIGHT_DOMAIN,
-]
+})
 
 # Presence entities
 PRESENCE_BINARY_SENSOR_DEVICE_CLASSES = (
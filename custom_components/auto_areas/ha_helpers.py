@@ -1,8 +1,9 @@
 """Collection of utility methods for dealing with HomeAssistant."""
-from typing import Optional
+from collections.abc import Collection, Iterable
 import logging
 from homeassistant.core import HomeAssistant
 from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.device_registry import DeviceRegistry
 from homeassistant.helpers.entity_registry import EntityRegistry, RegistryEntry
 
@@ -10,23 +11,38 @@ from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+# States of entities that should not be included
+INVALID_STATES = frozenset({STATE_UNAVAILABLE, STATE_UNKNOWN})
+
 
 def get_all_entities(
     entity_registry: EntityRegistry,
     device_registry: DeviceRegistry,
     area_id: str,
-    domains: list[str] | None = None,
-    device_class: list[str] | None = None,
+    domains: Collection[str] | None = None,
+    device_class: Collection[str] | None = None,
     exclude_auto_areas: bool = False
 ) -> list[RegistryEntry]:
     """Return all entities from an area."""
-    entities: list[RegistryEntry] = []
+    if domains is None:
+        return []
+
+    # Entities assigned to the area directly, or inheriting it from their device
+    candidates: dict[str, RegistryEntry] = {
+        entity.entity_id: entity
+        for entity in er.async_entries_for_area(entity_registry, area_id)
+    }
+    for device in dr.async_entries_for_area(device_registry, area_id):
+        for entity in er.async_entries_for_device(
+            entity_registry, device.id, include_disabled_entities=True
+        ):
+            if entity.area_id is None:
+                candidates.setdefault(entity.entity_id, entity)
 
-    for _entity_id, entity in entity_registry.entities.items():
-        if get_area_id(entity, device_registry) != area_id:
-            continue
+    entities: list[RegistryEntry] = []
 
-        if domains is None or entity.domain not in domains:
+    for entity in candidates.values():
+        if entity.domain not in domains:
             continue
 
         if device_class is not None and \
@@ -41,24 +57,6 @@ def get_all_entities(
     return entities
 
 
-def get_area_id(
-    entity: RegistryEntry, device_registry: DeviceRegistry
-) -> Optional[str]:
-    """Get area_id from a registry entry."""
-
-    # Defined directly at entity
-    if entity.area_id is not None:
-        return entity.area_id
-
-    # Inherited from device
-    if entity.device_id is not None:
-        device = device_registry.devices.get(entity.device_id)
-        if device is not None:
-            return device.area_id
-
-    return None
-
-
 def all_states_are_off(
     hass: HomeAssistant,
     presence_indicating_entity_ids: list[str],
@@ -71,13 +69,15 @@ def all_states_are_off(
     return all(state.state not in on_states for state in filter(None, all_states))
 
 
-def is_valid_entity(hass: HomeAssistant, entity: RegistryEntry) -> bool:
-    """Check whether an entity should be included."""
-    if entity.disabled:
-        return False
-
-    entity_state = hass.states.get(entity.entity_id)
-    if not entity_state or entity_state.state == STATE_UNAVAILABLE or entity_state.state == STATE_UNKNOWN:
-        return False
-
-    return True
+def filter_valid_entities(
+    hass: HomeAssistant, entities: Iterable[RegistryEntry]
+) -> list[RegistryEntry]:
+    """Return the enabled entities that have a valid state."""
+    states_get = hass.states.get
+    return [
+        entity
+        for entity in entities
+        if not entity.disabled
+        and (entity_state := states_get(entity.entity_id)) is not None
+        and entity_state.state not in INVALID_STATES
+    ]
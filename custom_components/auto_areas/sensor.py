@@ -11,7 +11,6 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.const import LIGHT_LUX, PERCENTAGE, STATE_UNKNOWN
 
 from .auto_entity import AutoEntity
-from .calculations import calculate_min, calculate_max
 from .auto_area import AutoArea
 from .const import (
     DOMAIN,
@@ -40,14 +39,14 @@ class AutoSensorEntity(AutoEntity[SensorEntity, SensorDeviceClass, float], Senso
     @override
     def _get_state(self) -> float | str | None:
         self._attr_native_value = super()._get_state()
-        values = list(self.entity_states.values())
+        values = self._numeric_values
         if len(values) == 0:
-            self._extra_attributes = {}
+            self._set_extra_attributes({})
         else:
-            self._extra_attributes = {
-                "min": calculate_min(values),
-                "max": calculate_max(values)
-            }
+            self._set_extra_attributes({
+                "min": values.minimum,
+                "max": values.maximum
+            })
         return self._attr_native_value
 
 
@@ -16,8 +16,6 @@ from .auto_area import AutoArea
 from .const import (
     LOGGER,
     DOMAIN,
-    NAME,
-    VERSION,
     CONFIG_IS_SLEEPING_AREA,
     PRESENCE_LOCK_SWITCH_PREFIX,
     SLEEP_MODE_SWITCH_PREFIX,
@@ -64,13 +62,7 @@ class PresenceLockSwitch(SwitchEntity):
     @cached_property
     def device_info(self) -> DeviceInfo:
         """Information about this device."""
-        return {
-            "identifiers": {(DOMAIN, self.auto_area.config_entry.entry_id)},
-            "name": NAME,
-            "model": VERSION,
-            "manufacturer": NAME,
-            "suggested_area": self.auto_area.area_name,
-        }
+        return self.auto_area.device_info
 
     @cached_property
     def device_class(self) -> SwitchDeviceClass | None:
@@ -122,13 +114,7 @@ class SleepModeSwitch(SwitchEntity):
     @cached_property
     def device_info(self) -> DeviceInfo:
         """Information about this device."""
-        return {
-            "identifiers": {(DOMAIN, self.auto_area.config_entry.entry_id)},
-            "name": NAME,
-            "model": VERSION,
-            "manufacturer": NAME,
-            "suggested_area": self.auto_area.area_name,
-        }
+        return self.auto_area.device_info
 
     @cached_property
     def device_class(self) -> SwitchDeviceClass | None:
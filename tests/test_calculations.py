@@ -0,0 +1,178 @@
+"""Test Auto Areas calculations."""
+
+from datetime import datetime, timedelta
+from math import fsum
+
+import pytest
+from homeassistant.const import STATE_UNKNOWN
+from homeassistant.core import State
+
+from custom_components.auto_areas.calculations import (
+    CALCULATE_ALL,
+    CALCULATE_LAST,
+    CALCULATE_MAX,
+    CALCULATE_MEAN,
+    CALCULATE_MEDIAN,
+    CALCULATE_MIN,
+    CALCULATE_NONE,
+    CALCULATE_ONE,
+    BooleanAggregator,
+    NumericAggregator,
+    create_aggregator,
+)
+
+NOW = datetime(2024, 7, 1, 12, 0, 0)
+
+
+def state(entity_id: str, value: str, seconds: int = 0) -> State:
+    """Create a state updated the given number of seconds after NOW."""
+    return State(entity_id, value, last_updated=NOW + timedelta(seconds=seconds))
+
+
+@pytest.mark.parametrize(
+    "key", [CALCULATE_MAX, CALCULATE_MIN, CALCULATE_MEAN, CALCULATE_MEDIAN,
+            CALCULATE_ALL, CALCULATE_ONE, CALCULATE_NONE, CALCULATE_LAST]
+)
+def test_empty(key):
+    """Test aggregators without values are unknown."""
+    aggregator = create_aggregator(key)
+    assert aggregator is not None
+    assert aggregator.value == STATE_UNKNOWN
+    aggregator.remove("sensor.missing")
+    assert aggregator.value == STATE_UNKNOWN
+
+
+def test_unknown_calculation():
+    """Test no aggregator is created without a known calculation."""
+    assert create_aggregator(None) is None
+    assert create_aggregator("unknown") is None
+
+
+@pytest.mark.parametrize(
+    ("key", "expected", "replaced", "removed"),
+    [
+        (CALCULATE_MAX, 30.0, 25.0, 20.0),
+        (CALCULATE_MIN, 10.0, 15.0, 20.0),
+        (CALCULATE_MEAN, 20.0, 20.0, 20.0),
+        (CALCULATE_MEDIAN, 20.0, 20.0, 20.0),
+    ],
+)
+def test_numeric(key, expected, replaced, removed):
+    """Test numeric aggregators on update, replacement, removal and clear."""
+    aggregator = create_aggregator(key)
+    assert aggregator is not None
+    aggregator.update("sensor.a", 10.0)
+    aggregator.update("sensor.b", 20.0)
+    aggregator.update("sensor.c", 30.0)
+    assert aggregator.value == expected
+
+    # a = 25, b = 20, c = 15
+    aggregator.update("sensor.a", 25.0)
+    aggregator.update("sensor.c", 15.0)
+    assert aggregator.value == replaced
+
+    aggregator.remove("sensor.a")
+    aggregator.remove("sensor.c")
+    assert aggregator.value == removed
+
+    aggregator.clear()
+    assert aggregator.value == STATE_UNKNOWN
+    aggregator.update("sensor.a", 5.0)
+    assert aggregator.value == 5.0
+
+
+def test_median_even():
+    """Test the median of an even number of values."""
+    aggregator = create_aggregator(CALCULATE_MEDIAN)
+    assert aggregator is not None
+    for entity_id, value in (("a", 4.0), ("b", 1.0), ("c", 3.0), ("d", 2.0)):
+        aggregator.update(entity_id, value)
+    assert aggregator.value == 2.5
+
+
+def test_mean_exact():
+    """Test the mean equals the precise mean after values were replaced."""
+    aggregator = create_aggregator(CALCULATE_MEAN)
+    assert aggregator is not None
+    values = {"sensor.a": 22.2, "sensor.b": 22.5, "sensor.c": 22.8}
+    for entity_id, value in values.items():
+        aggregator.update(entity_id, value)
+    assert aggregator.value == 22.5
+
+    for value in (21.3, 21.4, 21.3, 0.1, 1e16, 22.2):
+        aggregator.update("sensor.a", value)
+        values["sensor.a"] = value
+        assert aggregator.value == fsum(values.values()) / len(values)
+    assert aggregator.value == 22.5
+
+
+def test_numeric_statistics():
+    """Test the statistics are kept without a numeric calculation."""
+    aggregator = NumericAggregator()
+    for entity_id, value in (("a", 4.0), ("b", 1.0), ("c", 3.0)):
+        aggregator.update(entity_id, value)
+    aggregator.update("b", 5.0)
+    assert len(aggregator) == 3
+    assert (aggregator.minimum, aggregator.maximum) == (3.0, 5.0)
+    assert (aggregator.mean, aggregator.median) == (4.0, 4.0)
+    assert aggregator.value == STATE_UNKNOWN
+
+    aggregator.remove("b")
+    assert (aggregator.minimum, aggregator.maximum) == (3.0, 4.0)
+
+
+@pytest.mark.parametrize(
+    ("key", "states", "expected"),
+    [
+        (CALCULATE_ALL, ["on", "on"], True),
+        (CALCULATE_ALL, ["on", "off"], False),
+        (CALCULATE_ONE, ["off", "on"], True),
+        (CALCULATE_ONE, ["off", "off"], False),
+        (CALCULATE_NONE, ["off", "off"], True),
+        (CALCULATE_NONE, ["on", "off"], False),
+    ],
+)
+def test_boolean(key, states, expected):
+    """Test boolean aggregators count true and false states."""
+    aggregator = create_aggregator(key)
+    assert isinstance(aggregator, BooleanAggregator)
+    for index, value in enumerate(states):
+        aggregator.update(f"binary_sensor.{index}", state(f"binary_sensor.{index}", value))
+    aggregator.update("sensor.other", state("sensor.other", "not a bool"))
+    assert aggregator.value is expected
+    assert aggregator.num_true == states.count("on")
+    assert aggregator.num_false == states.count("off")
+
+    aggregator.remove("binary_sensor.0")
+    assert aggregator.num_true + aggregator.num_false == len(states) - 1
+    aggregator.clear()
+    assert (aggregator.num_true, aggregator.num_false) == (0, 0)
+    assert aggregator.value == STATE_UNKNOWN
+
+
+def test_boolean_replacement():
+    """Test replacing a state moves it between the counters."""
+    aggregator = create_aggregator(CALCULATE_ALL)
+    assert isinstance(aggregator, BooleanAggregator)
+    aggregator.update("binary_sensor.a", state("binary_sensor.a", "on"))
+    aggregator.update("binary_sensor.a", state("binary_sensor.a", "off"))
+    assert (aggregator.num_true, aggregator.num_false) == (0, 1)
+    assert aggregator.value is False
+
+
+def test_last():
+    """Test the last aggregator follows the most recently updated state."""
+    aggregator = create_aggregator(CALCULATE_LAST)
+    assert aggregator is not None
+    aggregator.update("sensor.a", state("sensor.a", "1", 0))
+    aggregator.update("sensor.b", state("sensor.b", "2", 1))
+    assert aggregator.value == "2"
+
+    aggregator.update("sensor.a", state("sensor.a", "3", 2))
+    assert aggregator.value == "3"
+
+    aggregator.remove("sensor.a")
+    assert aggregator.value == "2"
+
+    aggregator.clear()
+    assert aggregator.value == STATE_UNKNOWN
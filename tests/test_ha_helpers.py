@@ -0,0 +1,133 @@
+"""Test Auto Areas Home Assistant helpers."""
+
+import pytest
+from homeassistant.components.sensor.const import SensorDeviceClass
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.auto_areas.const import DOMAIN
+from custom_components.auto_areas.ha_helpers import get_all_entities
+
+
+@pytest.fixture(name="kitchen")
+def kitchen_fixture(area_registry: ar.AreaRegistry) -> ar.AreaEntry:
+    """Create the area to look up the entities of."""
+    return area_registry.async_create("Kitchen")
+
+
+@pytest.fixture(name="device")
+def device_fixture(
+    hass, device_registry: dr.DeviceRegistry, kitchen: ar.AreaEntry
+) -> dr.DeviceEntry:
+    """Create a device in the kitchen."""
+    config_entry = MockConfigEntry(domain="test")
+    config_entry.add_to_hass(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={("test", "device")},
+    )
+    return device_registry.async_update_device(device.id, area_id=kitchen.id)
+
+
+def entity_ids(entities: list[er.RegistryEntry]) -> set[str]:
+    """Return the entity ids of the registry entries."""
+    return {entity.entity_id for entity in entities}
+
+
+@pytest.mark.asyncio
+async def test_no_domains(entity_registry, device_registry, kitchen, device):
+    """Test nothing is returned without domains."""
+    entity_registry.async_get_or_create(
+        "sensor", "test", "temperature", device_id=device.id)
+
+    assert get_all_entities(entity_registry, device_registry, kitchen.id) == []
+
+
+@pytest.mark.asyncio
+async def test_entity_area_overrides_device_area(
+    entity_registry, device_registry, area_registry, kitchen, device
+):
+    """Test an entity assigned to another area is not taken from its device."""
+    office = area_registry.async_create("Office")
+    inherited = entity_registry.async_get_or_create(
+        "sensor", "test", "inherited", device_id=device.id)
+    moved = entity_registry.async_get_or_create(
+        "sensor", "test", "moved", device_id=device.id)
+    entity_registry.async_update_entity(moved.entity_id, area_id=office.id)
+    assigned = entity_registry.async_get_or_create("sensor", "test", "assigned")
+    entity_registry.async_update_entity(assigned.entity_id, area_id=kitchen.id)
+
+    assert entity_ids(get_all_entities(
+        entity_registry, device_registry, kitchen.id, ["sensor"]
+    )) == {inherited.entity_id, assigned.entity_id}
+    assert entity_ids(get_all_entities(
+        entity_registry, device_registry, office.id, ["sensor"]
+    )) == {moved.entity_id}
+
+
+@pytest.mark.asyncio
+async def test_disabled_device_entities(
+    entity_registry, device_registry, kitchen, device
+):
+    """Test disabled entities of a device in the area are returned."""
+    disabled = entity_registry.async_get_or_create(
+        "sensor", "test", "disabled", device_id=device.id,
+        disabled_by=er.RegistryEntryDisabler.USER)
+
+    assert entity_ids(get_all_entities(
+        entity_registry, device_registry, kitchen.id, ["sensor"]
+    )) == {disabled.entity_id}
+
+
+@pytest.mark.asyncio
+async def test_domain_and_device_class(
+    entity_registry, device_registry, kitchen, device
+):
+    """Test entities are filtered by domain and device class."""
+    temperature = entity_registry.async_get_or_create(
+        "sensor", "test", "temperature", device_id=device.id,
+        original_device_class=SensorDeviceClass.TEMPERATURE)
+    humidity = entity_registry.async_get_or_create(
+        "sensor", "test", "humidity", device_id=device.id,
+        original_device_class=SensorDeviceClass.HUMIDITY)
+    # The device class set by the user takes precedence
+    overridden = entity_registry.async_get_or_create(
+        "sensor", "test", "overridden", device_id=device.id)
+    entity_registry.async_update_entity(
+        overridden.entity_id, device_class=SensorDeviceClass.TEMPERATURE)
+    light = entity_registry.async_get_or_create(
+        "light", "test", "light", device_id=device.id)
+
+    assert entity_ids(get_all_entities(
+        entity_registry, device_registry, kitchen.id, ["light"]
+    )) == {light.entity_id}
+    assert entity_ids(get_all_entities(
+        entity_registry, device_registry, kitchen.id, ["sensor", "light"]
+    )) == {temperature.entity_id, humidity.entity_id, overridden.entity_id, light.entity_id}
+    assert entity_ids(get_all_entities(
+        entity_registry, device_registry, kitchen.id, ["sensor", "light"],
+        device_class=[SensorDeviceClass.TEMPERATURE]
+    )) == {temperature.entity_id, overridden.entity_id}
+
+
+@pytest.mark.asyncio
+async def test_exclude_auto_areas(
+    entity_registry, device_registry, kitchen, device
+):
+    """Test the entities of this integration can be excluded."""
+    sensor = entity_registry.async_get_or_create(
+        "sensor", "test", "temperature", device_id=device.id)
+    auto_area = entity_registry.async_get_or_create("sensor", DOMAIN, "temperature")
+    entity_registry.async_update_entity(auto_area.entity_id, area_id=kitchen.id)
+
+    assert entity_ids(get_all_entities(
+        entity_registry, device_registry, kitchen.id, ["sensor"]
+    )) == {sensor.entity_id, auto_area.entity_id}
+    assert entity_ids(get_all_entities(
+        entity_registry, device_registry, kitchen.id, ["sensor"],
+        exclude_auto_areas=True
+    )) == {sensor.entity_id}